@@ -0,0 +1,276 @@
+import concurrent.futures
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import os.path
+import sys
+import threading
+import traceback
+import urllib.error
+import urllib.request
+
+# To use this, download and copy pdl.py from here beside this file
+# https://github.com/nodejs/node/blob/e31a99f01b8a92615ce79b845441949424cd1dda/tools/inspector_protocol/pdl.py
+#
+# Parsing is most of the time these scripts take. It can be sped up either by
+# running `mypyc pdl.py` in this directory, which builds an extension module
+# that `import pdl` picks up over the source file, or by running the scripts
+# with `pypy3` instead of `python`.
+import pdl
+
+build_dir = os.path.dirname(os.path.abspath(__file__))
+js_debug_pdl_path = os.path.join(build_dir, "..", "adapter", "cdpProxy.pdl")
+inspector_pdl_url = "https://raw.githubusercontent.com/nodejs/node/master/src/inspector/node_protocol.pdl"
+
+# Downloaded PDL files are kept here, along with the validators that let us
+# make a conditional request for them the next time around.
+cache_dir = os.path.join(build_dir, ".pdl-cache")
+cache_index_path = os.path.join(cache_dir, "etag.json")
+
+copyright_header = (
+    "/*---------------------------------------------------------\n"
+    " * Copyright (C) Microsoft Corporation. All rights reserved.\n"
+    " *--------------------------------------------------------*/\n"
+)
+
+# pdl.loads() keeps the description of the item it is parsing in a module-level
+# global, so concurrent parses would attach descriptions to the wrong items.
+pdl_lock = threading.Lock()
+
+# Written after the header of generated files. Holds a hash of everything that
+# went into the file, followed by a hash of everything else in the file, so
+# that we can skip regenerating it or rewriting it when nothing changed.
+hash_marker = "// @pdl-hash: "
+
+
+def read_code_hash():
+    h = hashlib.sha256()
+    for path in (pdl.__file__, __file__):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.digest()
+
+
+# Hashed once, while the code is being loaded, so a long-lived --watch process
+# keeps stamping outputs with the hash of the code it is actually running even
+# if pdl.py or this file are edited after it starts.
+code_hash = read_code_hash()
+
+
+def input_hash(pdl_source, header):
+    h = hashlib.sha256(pdl_source.encode("utf-8"))
+    h.update(header.encode("utf-8"))
+    h.update(code_hash)
+    return h.hexdigest()
+
+
+def read_output_hashes(out_path):
+    """Returns the (input, output) hashes recorded in out_path, if any."""
+    try:
+        with open(out_path, encoding="utf-8") as f:
+            for line in itertools.islice(f, 10):
+                if line.startswith(hash_marker):
+                    hashes = line[len(hash_marker) :].split()
+                    return (hashes + [None, None])[:2]
+    except (OSError, UnicodeDecodeError):
+        pass
+    return None, None
+
+
+def generate(pdl_source, out_path, header=copyright_header, file_name="protocol.pdl"):
+    """Parses the PDL text in pdl_source and writes it as a TS module to out_path."""
+    digest = input_hash(pdl_source, header)
+    old_digest, old_output_digest = read_output_hashes(out_path)
+    if old_digest == digest:
+        return
+
+    with pdl_lock:
+        pdl_contents = pdl.loads(pdl_source, file_name, True)
+    # Serialize in one go: json.dump() would issue a write per token.
+    body = json.dumps(pdl_contents, indent=2, separators=(",", ": "))
+    output_digest = hashlib.sha256((header + body).encode("utf-8")).hexdigest()
+    if old_output_digest == output_digest:
+        # The inputs changed without changing the output, e.g. a comment was
+        # edited in pdl.py. Leave the file and its mtime alone rather than
+        # touching it just to update its input hash; this means later runs
+        # parse again until the output really changes, which is far cheaper
+        # than making tsc and file watchers pick up a rewritten file.
+        return
+
+    output = "".join(
+        [
+            header,
+            hash_marker + digest + " " + output_digest + "\n",
+            "\n",
+            "export default ",
+            body,
+        ]
+    )
+    write_atomic(out_path, output.encode("utf-8"))
+
+
+def write_atomic(path, contents):
+    """Replaces the file at path with contents, so readers never see it half-written."""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as o:
+            o.write(contents)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_cache_index():
+    try:
+        with open(cache_index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # A hand-edited or otherwise mangled index is treated as an empty one.
+    return index if isinstance(index, dict) else {}
+
+
+def read_cached(cache_path, entry):
+    """Returns the cached body at cache_path if it matches the hash recorded in entry."""
+    try:
+        with open(cache_path, "rb") as f:
+            body = f.read()
+    except OSError:
+        return None
+    if hashlib.sha256(body).hexdigest() != entry.get("sha256"):
+        return None
+    return body
+
+
+def download(url, entry=None):
+    """
+    Downloads the file at url, returning (body, etag, last_modified). If entry
+    is given, the request is made conditional on its validators, and body is
+    None when the server reports the file is unchanged.
+    """
+    headers = {"Accept-Encoding": "gzip", "User-Agent": "vscode-js-debug-build"}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as r:
+            if r.headers.get("Content-Encoding") == "gzip":
+                body = gzip.GzipFile(fileobj=r).read()
+            else:
+                body = r.read()
+            return body, r.headers.get("ETag"), r.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not entry:
+            raise
+        return None, None, None
+
+
+def fetch_cached(url):
+    """Downloads the file at url, returning the cached copy if the server reports it is unchanged."""
+    entry = read_cache_index().get(url)
+    cache_path = os.path.join(cache_dir, os.path.basename(url))
+
+    # Only make a conditional request if we have a cached copy to fall back
+    # to; a missing or corrupt one is fetched again in full.
+    cached = read_cached(cache_path, entry) if entry else None
+    body, etag, last_modified = download(url, entry if cached is not None else None)
+    if body is None:
+        return cached
+
+    os.makedirs(cache_dir, exist_ok=True)
+    write_atomic(cache_path, body)
+    # Re-read the index in case another download updated it in the meantime.
+    # It is written after the body, so an interrupted run leaves at worst an
+    # entry whose hash does not match, which read_cached() rejects.
+    index = read_cache_index()
+    index[url] = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "sha256": hashlib.sha256(body).hexdigest(),
+    }
+    write_atomic(cache_index_path, json.dumps(index, indent=2).encode("utf-8"))
+    return body
+
+
+def generate_js_debug():
+    with open(js_debug_pdl_path, encoding="utf-8") as r:
+        generate(
+            r.read(),
+            os.path.join(build_dir, "jsDebugCustom.ts"),
+            file_name="cdpProxy.pdl",
+        )
+
+
+def generate_node():
+    generate(
+        fetch_cached(inspector_pdl_url).decode("utf-8"),
+        os.path.join(build_dir, "nodeCustom.ts"),
+        file_name="node_protocol.pdl",
+    )
+
+
+generators = {"jsDebug": generate_js_debug, "node": generate_node}
+
+
+class GenerateError(Exception):
+    pass
+
+
+def regenerate(executor, names):
+    # Parsing is serialized by pdl_lock, but the node download and the input
+    # hashing of each job still overlap with the other job's parse.
+    futures = {executor.submit(generators[name]): name for name in names}
+    concurrent.futures.wait(futures)
+
+    failed = []
+    for future, name in futures.items():
+        e = future.exception()
+        if e is not None:
+            print(f"Failed to generate {name}:", file=sys.stderr)
+            traceback.print_exception(type(e), e, e.__traceback__)
+            failed.append(name)
+    if failed:
+        raise GenerateError(f"Failed to generate {', '.join(failed)}")
+
+
+def watch(executor):
+    """
+    Regenerates outputs each time a line is read from stdin, so that a file
+    watcher can trigger codegen without paying for a new interpreter and
+    pdl import each time. A line may name one of the generators; an empty
+    line regenerates everything.
+    """
+    for line in sys.stdin:
+        name = line.strip()
+        if name and name not in generators:
+            print(
+                f"Unknown generator {name!r}, expected one of {list(generators)}",
+                flush=True,
+            )
+            continue
+        try:
+            regenerate(executor, [name] if name else generators)
+        except GenerateError as e:
+            print(e, flush=True)
+        else:
+            print("Done", flush=True)
+
+
+if __name__ == "__main__":
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        if "--watch" in sys.argv[1:]:
+            watch(executor)
+        else:
+            try:
+                regenerate(executor, generators)
+            except GenerateError as e:
+                sys.exit(str(e))